@@ -2,62 +2,87 @@
 """
 Configuration for Instagram Reel Fetcher and AI Enhancer.
 Loads settings from environment variables with sensible defaults.
+
+Settings are resolved lazily: the .env read and the filesystem resolve()
+only happen on first access, so importing this module costs nothing for
+tools that never touch the config.
 """
 
+import functools
 import os
+from dataclasses import dataclass
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
 
-# =============================================================================
-# Base Directory (script location)
-# =============================================================================
+@dataclass(frozen=True)
+class Config:
+    """Resolved configuration, built once by get_config()."""
 
-SCRIPT_DIR = Path(__file__).parent.resolve()
+    # Base directory (script location)
+    SCRIPT_DIR: Path
 
-# =============================================================================
-# API Configuration
-# =============================================================================
+    # API configuration
+    GOOGLE_API_KEY: str
 
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
+    # Model configuration
+    QUALITY_CHECK_MODEL: str
+    ENHANCEMENT_MODEL: str
 
-# =============================================================================
-# Model Configuration
-# =============================================================================
+    # Processing options
+    AUTO_ENHANCE: bool
 
-QUALITY_CHECK_MODEL = os.getenv(
-    "QUALITY_CHECK_MODEL", "gemini-flash-lite-latest")
-ENHANCEMENT_MODEL = os.getenv("ENHANCEMENT_MODEL", "gemini-3-flash-preview")
+    # Paths - all configurable via .env, with sensible defaults
+    NOTES_DIR: Path
+    ATTACHMENTS_DIR: Path
+    TEMP_DIR: Path
+    QUEUE_FILE: Path
 
-# =============================================================================
-# Processing Options
-# =============================================================================
 
-AUTO_ENHANCE = os.getenv("AUTO_ENHANCE", "true").lower() == "true"
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Load .env and resolve all settings (cached after the first call)."""
+    load_dotenv()
 
-# =============================================================================
-# Paths - All configurable via .env, with sensible defaults
-# =============================================================================
+    script_dir = Path(__file__).parent.resolve()
 
-# Notes/markdown output directory
-NOTES_DIR = Path(os.getenv("NOTES_DIR", str(SCRIPT_DIR / "data")))
+    # Notes/markdown output directory
+    notes_dir = Path(os.getenv("NOTES_DIR", str(script_dir / "data")))
 
-# Video/attachments output directory
-ATTACHMENTS_DIR = Path(os.getenv("ATTACHMENTS_DIR", str(SCRIPT_DIR / "video")))
+    return Config(
+        SCRIPT_DIR=script_dir,
+        GOOGLE_API_KEY=os.getenv("GOOGLE_API_KEY", ""),
+        QUALITY_CHECK_MODEL=os.getenv(
+            "QUALITY_CHECK_MODEL", "gemini-flash-lite-latest"),
+        ENHANCEMENT_MODEL=os.getenv(
+            "ENHANCEMENT_MODEL", "gemini-3-flash-preview"),
+        AUTO_ENHANCE=os.getenv("AUTO_ENHANCE", "true").lower() == "true",
+        NOTES_DIR=notes_dir,
+        # Video/attachments output directory
+        ATTACHMENTS_DIR=Path(
+            os.getenv("ATTACHMENTS_DIR", str(script_dir / "video"))),
+        # Temporary files directory (downloads, compression, tracking)
+        TEMP_DIR=Path(os.getenv("TEMP_DIR", str(script_dir / "temp"))),
+        # Queue file for watcher mode
+        QUEUE_FILE=Path(os.getenv("QUEUE_FILE", str(
+            notes_dir / "Instagram Queue.md"))),
+    )
 
-# Temporary files directory (downloads, compression, tracking)
-TEMP_DIR = Path(os.getenv("TEMP_DIR", str(SCRIPT_DIR / "temp")))
 
-# Queue file for watcher mode
-QUEUE_FILE = Path(os.getenv("QUEUE_FILE", str(
-    NOTES_DIR / "Instagram Queue.md")))
+def __getattr__(name: str):
+    """Forward module-level attribute access to the cached Config (PEP 562),
+    so `from config import NOTES_DIR` keeps working unchanged."""
+    config = get_config()
+    try:
+        return getattr(config, name)
+    except AttributeError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}") from None
 
 
 def validate_config() -> bool:
     """Validate that required configuration is present."""
-    if not GOOGLE_API_KEY:
+    if not get_config().GOOGLE_API_KEY:
         print("❌ Error: GOOGLE_API_KEY is not set!")
         print("   Please set it in your .env file or environment variables.")
         return False
@@ -66,6 +91,7 @@ def validate_config() -> bool:
 
 def ensure_directories():
     """Create all required directories if they don't exist."""
-    NOTES_DIR.mkdir(parents=True, exist_ok=True)
-    ATTACHMENTS_DIR.mkdir(parents=True, exist_ok=True)
-    TEMP_DIR.mkdir(parents=True, exist_ok=True)
+    config = get_config()
+    config.NOTES_DIR.mkdir(parents=True, exist_ok=True)
+    config.ATTACHMENTS_DIR.mkdir(parents=True, exist_ok=True)
+    config.TEMP_DIR.mkdir(parents=True, exist_ok=True)
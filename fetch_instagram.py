@@ -5,21 +5,31 @@ Can be used as a CLI tool or imported as a module.
 """
 
 import argparse
+import atexit
+import hashlib
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter, Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
 import json
+import os
 import re
 import subprocess
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
-# Headers to mimic a browser request (Instagram blocks requests without proper headers)
-HEADERS = {
+# Headers to mimic a browser request (Instagram blocks requests without
+# proper headers). Read-only: the shared session copies these once at
+# import, so nothing should (or can) mutate them afterwards.
+HEADERS = MappingProxyType({
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
     "Accept-Language": "en-US,en;q=0.9",
-    "Accept-Encoding": "gzip, deflate",
+    "Accept-Encoding": "br, gzip, deflate",
     "Connection": "keep-alive",
     "Upgrade-Insecure-Requests": "1",
     "Sec-Fetch-Dest": "document",
@@ -27,27 +37,154 @@ HEADERS = {
     "Sec-Fetch-Site": "none",
     "Sec-Fetch-User": "?1",
     "Cache-Control": "max-age=0",
-}
-
-
-def fetch_instagram_reel(url: str) -> requests.Response:
+})
+
+# Shared session so repeated fetches reuse one connection pool (DNS, TCP
+# and TLS handshakes are paid once per host instead of once per reel).
+# The pool is sized for fetch_many's default concurrency so parallel
+# fetches don't queue on a single connection, and transient failures
+# (rate limits, gateway errors) retry with backoff instead of surfacing
+# straight to the caller.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+    ),
+))
+atexit.register(SESSION.close)
+
+# Compiled once at import - validating URLs on entry is a hot path for the
+# watcher, and a precompiled pattern skips the re-module cache lookup
+INSTAGRAM_URL_RE = re.compile(
+    r'^https?://(?:www\.)?instagram\.com/(?:reel|p)/[\w-]+/?')
+
+# orjson decodes JSON ~3x faster than the stdlib; fall back quietly
+# since the blobs involved are small
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Captions are user-supplied, so prefer Google's re2 (linear-time DFA, no
+# catastrophic backtracking) for the description patterns when available
+try:
+    import re2 as _re_engine
+except ImportError:
+    _re_engine = re
+
+
+def _compile_safe(pattern: str, flags: int = 0):
+    """Compile with re2 when available, falling back to stdlib re for
+    patterns or flags re2 doesn't support."""
+    if _re_engine is not re:
+        try:
+            return _re_engine.compile(pattern, flags)
+        except Exception:
+            pass
+    return re.compile(pattern, flags)
+
+
+# Length bounds for the description pattern groups. Instagram captions
+# cap around 2,200 characters and usernames at 30, so these are generous;
+# bounding the quantifiers keeps stdlib re's backtracking search space
+# small even on adversarial input (module-level so they can be tuned
+# without editing the pattern string). None may exceed 1000: that is
+# re2's repetition-count limit, and a larger bound would silently kick
+# _compile_safe back to stdlib re for exactly the caption-scanning
+# pattern re2 is there for. Well-formed captions of any length take the
+# partition fast path in parse_description, so the regex only sees the
+# odd cases.
+_MAX_COUNT_LEN = 12      # "999,999,999" likes/comments
+_MAX_META_LEN = 300      # "username on Month DD, YYYY"
+_MAX_DESC_LEN = 1000     # caption text (re2 repetition ceiling)
+
+# Description parsing patterns, compiled once rather than per call.
+# The meta group is [^:]+ rather than a lazy .+? so the engine never has
+# to consider every colon in the caption as a potential terminator, and
+# \Z avoids $'s trailing-newline special case.
+_DESC_RE = _compile_safe(
+    r'^([\d,]{1,%d})\s+likes?,\s*([\d,]{1,%d})\s+comments?\s*-\s*'
+    r'([^:]{1,%d}):\s*["\"]?(.{0,%d})\Z'
+    % (_MAX_COUNT_LEN, _MAX_COUNT_LEN, _MAX_META_LEN, _MAX_DESC_LEN),
+    re.DOTALL)
+_STATS_RE = _compile_safe(
+    r'([\d,]{1,%d})\s+likes?,\s*([\d,]{1,%d})\s+comments?'
+    % (_MAX_COUNT_LEN, _MAX_COUNT_LEN))
+_META_RE = _compile_safe(r'(.+?)\s+on\s+(.+)')
+_REEL_ID_RE = re.compile(r'/(?:reel|p)/([\w-]+)')
+
+
+def fetch_instagram_reel(url: str, head_only: bool = False) -> requests.Response:
     """
     Fetch the Instagram reel page.
 
     Args:
         url: The Instagram reel URL to fetch
+        head_only: Stop reading the body once </head> is seen. All the
+                   metadata we extract lives in the head, while the body
+                   (the bulk of the page) is inlined script we never parse.
 
     Returns:
         The response object from the request
     """
     print(f"Fetching: {url}")
-    response = requests.get(url, headers=HEADERS, timeout=30)
+    response = SESSION.get(url, timeout=30, stream=head_only)
+    # Instagram always serves UTF-8; setting it explicitly skips the slow
+    # apparent-encoding sniff when response.text is accessed
+    response.encoding = "utf-8"
+
+    if head_only:
+        buf = bytearray()
+        for chunk in response.iter_content(chunk_size=16384):
+            buf += chunk
+            end = buf.find(b"</head>")
+            if end != -1:
+                del buf[end + len(b"</head>"):]
+                break
+        response.close()
+        # Materialize the truncated body so .content/.text work as usual
+        response._content = bytes(buf)
+        response._content_consumed = True
+
     print(f"Status Code: {response.status_code}")
     print(f"Content-Type: {response.headers.get('Content-Type', 'N/A')}")
     print(f"Content-Length: {len(response.content)} bytes")
     return response
 
 
+def fetch_many(urls: list[str], max_workers: int = 8) -> list[tuple]:
+    """
+    Fetch several Instagram pages concurrently over the shared session.
+
+    The work is network-bound, so overlapping the requests in a thread
+    pool collapses N round-trips into roughly one. A failed fetch is
+    reported per-URL instead of aborting the whole batch.
+
+    Args:
+        urls: Instagram URLs to fetch
+        max_workers: Maximum number of concurrent requests
+
+    Returns:
+        (url, response, error) tuples in the same order as the input
+        URLs; response is None when the fetch raised, error otherwise
+    """
+    def _fetch_one(url: str) -> tuple:
+        try:
+            return url, fetch_instagram_reel(url), None
+        except Exception as e:
+            print(f"❌ Fetch failed for {url}: {e}")
+            return url, None, e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_fetch_one, urls))
+
+
 def save_response_to_file(response: requests.Response, filename: str) -> None:
     """
     Save the raw response content to a file.
@@ -56,17 +193,18 @@ def save_response_to_file(response: requests.Response, filename: str) -> None:
         response: The response object to save
         filename: The output filename
     """
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(response.text)
+    with open(filename, "wb") as f:
+        f.write(response.content)
     print(f"Raw response saved to: {filename}")
 
 
-def parse_with_beautifulsoup(html_content: str) -> BeautifulSoup:
+def parse_with_beautifulsoup(html_content: str | bytes) -> BeautifulSoup:
     """
     Parse HTML content with BeautifulSoup.
 
     Args:
-        html_content: The HTML string to parse
+        html_content: The HTML to parse; bytes are handed to lxml
+                      directly, skipping a decode pass
 
     Returns:
         A BeautifulSoup object for navigating the parsed HTML
@@ -75,45 +213,184 @@ def parse_with_beautifulsoup(html_content: str) -> BeautifulSoup:
     return soup
 
 
-def extract_basic_info(soup: BeautifulSoup) -> dict:
+class _HeadParsed(Exception):
+    """Raised by _MetaCollector to abort parsing once the head is done."""
+
+
+class _MetaCollector:
+    """
+    lxml target parser that collects meta tag attributes from the document
+    head and aborts as soon as the body starts - Instagram pages are mostly
+    inlined script blobs we never need to parse.
+    """
+
+    def __init__(self):
+        self.by_name = {}
+        self.by_prop = {}
+
+    def start(self, tag, attrib):
+        if tag == "meta":
+            content = attrib.get("content", "N/A")
+            name = attrib.get("name")
+            if name:
+                self.by_name[name] = content
+            prop = attrib.get("property")
+            if prop:
+                self.by_prop[prop] = content
+        elif tag == "body":
+            raise _HeadParsed
+
+    def end(self, tag):
+        pass
+
+    def data(self, data):
+        pass
+
+    def close(self):
+        pass
+
+
+def extract_basic_info(html_content: str | bytes) -> dict:
     """
-    Extract basic information from the parsed HTML.
+    Extract basic information from the page HTML.
+
+    Uses a streaming lxml parse that stops at the end of the head; falls
+    back to BeautifulSoup for HTML the collector cannot handle.
 
     Args:
-        soup: BeautifulSoup object of the page
+        html_content: The raw page HTML; raw response bytes are parsed
+                      directly, avoiding a document-sized decode
 
     Returns:
         Dictionary with extracted information
     """
-    info = {}
+    meta_by_name = {}
+    meta_by_prop = {}
+
+    try:
+        collector = _MetaCollector()
+        parser = etree.HTMLParser(target=collector)
+        try:
+            parser.feed(html_content)
+            parser.close()
+        except _HeadParsed:
+            pass
+        meta_by_name = collector.by_name
+        meta_by_prop = collector.by_prop
+    except Exception:
+        # Fall back to BeautifulSoup for malformed HTML, parsing only up
+        # to the end of the head and only the meta tags (SoupStrainer
+        # skips tree construction for everything else), then walking
+        # them in a single pass
+        if isinstance(html_content, bytes):
+            head = html_content.split(b"</head>", 1)[0] + b"</head></html>"
+        else:
+            head = html_content.split("</head>", 1)[0] + "</head></html>"
+        soup = BeautifulSoup(head, "lxml", parse_only=SoupStrainer("meta"))
+        for tag in soup.find_all("meta"):
+            content = tag.get("content", "N/A")
+            name = tag.get("name")
+            if name:
+                meta_by_name[name] = content
+            prop = tag.get("property")
+            if prop:
+                meta_by_prop[prop] = content
+
+    return {
+        "title": meta_by_name.get("title", "N/A"),
+        "description": meta_by_name.get("description", "N/A"),
+        "og_title": meta_by_prop.get("og:title", "N/A"),
+        "og_description": meta_by_prop.get("og:description", "N/A"),
+        "og_image": meta_by_prop.get("og:image", "N/A"),
+        "og_video": meta_by_prop.get("og:video", "N/A"),
+    }
+
+
+_LD_JSON_MARKER = '<script type="application/ld+json">'
+_LD_JSON_MARKER_B = _LD_JSON_MARKER.encode()
+
+# Container formats yt-dlp may produce for Instagram video
+_VIDEO_EXTENSIONS = {"mp4", "webm", "mkv", "mov"}
+
+
+def extract_structured_description(html_content: str | bytes) -> dict | None:
+    """
+    Extract likes, comments, author, date, and caption from the page's
+    JSON-LD blob when present.
+
+    The structured data carries the same fields parse_description has to
+    regex back out of the English-formatted meta description, already
+    typed and unambiguous, so this is tried first.
 
-    # Try to get the meta title
-    meta_title = soup.find("meta", attrs={"name": "title"})
-    info["title"] = meta_title.get("content", "N/A") if meta_title else "N/A"
+    Args:
+        html_content: The raw page HTML
 
-    # Try to get meta description
-    meta_desc = soup.find("meta", attrs={"name": "description"})
-    info["description"] = meta_desc.get(
-        "content", "N/A") if meta_desc else "N/A"
+    Returns:
+        Dictionary shaped like parse_description's result, or None when
+        no usable JSON-LD is found (callers fall back to the meta path)
+    """
+    if isinstance(html_content, bytes):
+        marker, closer = _LD_JSON_MARKER_B, b"</script>"
+    else:
+        marker, closer = _LD_JSON_MARKER, "</script>"
+    idx = html_content.find(marker)
+    if idx == -1:
+        return None
+    start = idx + len(marker)
+    end = html_content.find(closer, start)
+    if end == -1:
+        return None
 
-    # Try to get og:title (Open Graph)
-    og_title = soup.find("meta", attrs={"property": "og:title"})
-    info["og_title"] = og_title.get("content", "N/A") if og_title else "N/A"
+    try:
+        data = _json_loads(html_content[start:end])
+    except ValueError:
+        return None
+    if isinstance(data, list):
+        data = data[0] if data else None
+    if not isinstance(data, dict):
+        return None
 
-    # Try to get og:description
-    og_desc = soup.find("meta", attrs={"property": "og:description"})
-    info["og_description"] = og_desc.get(
-        "content", "N/A") if og_desc else "N/A"
+    parsed = {
+        "likes": "N/A",
+        "comments": "N/A",
+        "meta": "N/A",
+        "author": "N/A",
+        "date": "N/A",
+        "description_text": "N/A"
+    }
 
-    # Try to get og:image (thumbnail)
-    og_image = soup.find("meta", attrs={"property": "og:image"})
-    info["og_image"] = og_image.get("content", "N/A") if og_image else "N/A"
+    try:
+        stats = data.get("interactionStatistic", [])
+        if isinstance(stats, dict):
+            stats = [stats]
+        for stat in stats:
+            count = stat.get("userInteractionCount")
+            if count is None:
+                continue
+            interaction_type = str(stat.get("interactionType", ""))
+            if "Like" in interaction_type:
+                parsed["likes"] = str(count)
+            elif "Comment" in interaction_type:
+                parsed["comments"] = str(count)
+
+        author = data.get("author")
+        if isinstance(author, dict) and author.get("name"):
+            parsed["author"] = str(author["name"])
+        if data.get("uploadDate"):
+            parsed["date"] = str(data["uploadDate"])
+        if data.get("description"):
+            parsed["description_text"] = str(data["description"]).strip()
+    except (KeyError, TypeError, AttributeError):
+        return None
 
-    # Try to get og:video (video URL)
-    og_video = soup.find("meta", attrs={"property": "og:video"})
-    info["og_video"] = og_video.get("content", "N/A") if og_video else "N/A"
+    if parsed["author"] != "N/A" and parsed["date"] != "N/A":
+        parsed["meta"] = f"{parsed['author']} on {parsed['date']}"
 
-    return info
+    # A blob with none of our fields (e.g. unrelated schema.org data)
+    # should not shadow the meta-description path
+    if all(value == "N/A" for value in parsed.values()):
+        return None
+    return parsed
 
 
 def parse_description(description: str) -> dict:
@@ -140,10 +417,33 @@ def parse_description(description: str) -> dict:
     if not description or description == "N/A":
         return parsed
 
-    # Pattern: "X likes, Y comments - username on Date: \"description text..."
-    pattern = r'^([\d,]+)\s+likes?,\s*([\d,]+)\s+comments?\s*-\s*(.+?):\s*["\"]?(.*)$'
+    # Fast path: the format is rigid, so two partitions and a short stats
+    # match cover the common case with no backtracking over the caption
+    stats_part, sep1, rest = description.partition(" - ")
+    if sep1:
+        stats_match = _STATS_RE.match(stats_part)
+        meta, sep2, desc_text = rest.partition(": ")
+        if stats_match and sep2:
+            parsed["likes"] = stats_match.group(1).replace(",", "")
+            parsed["comments"] = stats_match.group(2).replace(",", "")
+            meta = meta.strip()
+            parsed["meta"] = meta
+
+            author, sep3, date = meta.partition(" on ")
+            if sep3:
+                parsed["author"] = author.strip()
+                parsed["date"] = date.strip()
+
+            desc_text = desc_text.strip()
+            if desc_text[:1] in ('"', '“'):
+                desc_text = desc_text[1:]
+            if desc_text[-1:] in ('"', '”'):
+                desc_text = desc_text[:-1]
+            parsed["description_text"] = desc_text
+            return parsed
 
-    match = re.match(pattern, description, re.DOTALL)
+    # Pattern: "X likes, Y comments - username on Date: \"description text..."
+    match = _DESC_RE.match(description)
 
     if match:
         # TODO: Check on links and comments as they appear as null
@@ -153,24 +453,21 @@ def parse_description(description: str) -> dict:
         parsed["meta"] = meta
 
         # Extract author and date from meta (format: "username on Date")
-        meta_match = re.match(r'(.+?)\s+on\s+(.+)', meta)
+        meta_match = _META_RE.match(meta)
         if meta_match:
             parsed["author"] = meta_match.group(1).strip()
             parsed["date"] = meta_match.group(2).strip()
 
-        # Clean up the description text (remove trailing quote if present)
-        desc_text = match.group(4).strip()
-        if desc_text.endswith('"') or desc_text.endswith('"'):
-            desc_text = desc_text[:-1]
-        parsed["description_text"] = desc_text
+        # Clean up the description text (strip quote variants in one
+        # C-level pass rather than chained endswith checks)
+        parsed["description_text"] = match.group(4).strip().rstrip('"“”')
     else:
         # If pattern doesn't match, try a simpler split
         if " - " in description and ": " in description:
             parts = description.split(" - ", 1)
             if len(parts) == 2:
                 # Parse likes and comments from first part
-                stats_match = re.match(
-                    r'([\d,]+)\s+likes?,\s*([\d,]+)\s+comments?', parts[0])
+                stats_match = _STATS_RE.match(parts[0])
                 if stats_match:
                     parsed["likes"] = stats_match.group(1).replace(",", "")
                     parsed["comments"] = stats_match.group(2).replace(",", "")
@@ -182,14 +479,13 @@ def parse_description(description: str) -> dict:
                     parsed["meta"] = meta
 
                     # Extract author and date
-                    meta_match = re.match(r'(.+?)\s+on\s+(.+)', meta)
+                    meta_match = _META_RE.match(meta)
                     if meta_match:
                         parsed["author"] = meta_match.group(1).strip()
                         parsed["date"] = meta_match.group(2).strip()
 
-                    desc_text = meta_desc[1].strip().strip(
-                        '"').strip('"').strip('"')
-                    parsed["description_text"] = desc_text
+                    parsed["description_text"] = meta_desc[1].strip().strip(
+                        '"“”')
 
     return parsed
 
@@ -207,7 +503,7 @@ def download_video_with_ytdlp(url: str, output_dir: str = ".", filename: str | N
         Path to the downloaded video file, or None if failed
     """
     # Check if yt-dlp is installed
-    if not shutil.which("yt-dlp"):
+    if not _tool_path("yt-dlp"):
         print("\n⚠️  yt-dlp is not installed!")
         print("Install it with: pip install yt-dlp")
         print("Or: winget install yt-dlp")
@@ -231,33 +527,33 @@ def download_video_with_ytdlp(url: str, output_dir: str = ".", filename: str | N
     print(f"Command: {' '.join(cmd)}")
 
     try:
+        # Progress output goes to the bitbucket instead of a Python
+        # buffer; stderr is kept as bytes and only decoded on failure
         result = subprocess.run(
             cmd,
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             timeout=120  # 2 minute timeout
         )
 
         if result.returncode == 0:
-            # Find the downloaded file
-            for ext in ["mp4", "webm", "mkv"]:
-                video_path = Path(output_dir) / f"{filename}.{ext}"
-                if video_path.exists():
-                    print(f"✅ Video downloaded: {video_path}")
-                    return str(video_path)
-
-            # If specific extension not found, search for any matching file
-            for f in Path(output_dir).glob(f"{filename}.*"):
-                if f.suffix.lower() in [".mp4", ".webm", ".mkv", ".mov"]:
-                    print(f"✅ Video downloaded: {f}")
-                    return str(f)
+            # Find the downloaded file: one directory read covers every
+            # extension yt-dlp might have chosen, instead of a stat per
+            # candidate extension plus a glob
+            prefix = f"{filename}."
+            with os.scandir(output_dir) as entries:
+                for entry in entries:
+                    if (entry.name.startswith(prefix)
+                            and entry.name.rsplit(".", 1)[-1].lower()
+                            in _VIDEO_EXTENSIONS):
+                        print(f"✅ Video downloaded: {entry.path}")
+                        return entry.path
 
             print("✅ Download completed but couldn't locate file")
-            print(f"stdout: {result.stdout}")
             return None
         else:
             print(f"❌ Download failed!")
-            print(f"stderr: {result.stderr}")
+            print(f"stderr: {result.stderr.decode(errors='replace')}")
             return None
 
     except subprocess.TimeoutExpired:
@@ -268,6 +564,46 @@ def download_video_with_ytdlp(url: str, output_dir: str = ".", filename: str | N
         return None
 
 
+@lru_cache(maxsize=1)
+def _detect_hw_encoder() -> str:
+    """Pick the fastest available H.264 encoder, probing ffmpeg once.
+
+    GPU/VPU encoders (NVENC, VideoToolbox, Quick Sync) are typically
+    5-10x faster than libx264 for this footage. Override with the
+    VIDEO_ENCODER env var; libx264 is the fallback."""
+    override = os.getenv("VIDEO_ENCODER")
+    if override:
+        return override
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=10
+        )
+        available = result.stdout.decode(errors="replace")
+    except Exception:
+        return "libx264"
+    for encoder in ("h264_nvenc", "h264_videotoolbox", "h264_qsv"):
+        if encoder in available:
+            print(f"🎞️  Using hardware encoder: {encoder}")
+            return encoder
+    return "libx264"
+
+
+def _encoder_args(crf: int) -> list[str]:
+    """Codec arguments for the detected encoder - each encoder has its
+    own quality knob in place of libx264's -crf."""
+    encoder = _detect_hw_encoder()
+    if encoder == "h264_nvenc":
+        return ["-c:v", encoder, "-preset", "p4", "-cq", str(crf)]
+    if encoder == "h264_videotoolbox":
+        return ["-c:v", encoder, "-q:v", "50"]
+    if encoder == "h264_qsv":
+        return ["-c:v", encoder, "-global_quality", str(crf)]
+    return ["-c:v", encoder, "-crf", str(crf), "-preset", "medium"]
+
+
 def compress_video(input_path: str, output_path: str | None = None, crf: int = 28, max_height: int = 720) -> str | None:
     """
     Compress video using ffmpeg with medium quality settings.
@@ -281,7 +617,7 @@ def compress_video(input_path: str, output_path: str | None = None, crf: int = 2
     Returns:
         Path to the compressed video file, or None if failed
     """
-    if not shutil.which("ffmpeg"):
+    if not _tool_path("ffmpeg"):
         print("\n⚠️  ffmpeg is not installed!")
         print("Install it with: winget install ffmpeg")
         return None
@@ -309,15 +645,15 @@ def compress_video(input_path: str, output_path: str | None = None, crf: int = 2
     # ffmpeg command for medium compression
     # -crf 28: Good quality/size balance
     # -vf scale: Scale to max height while preserving aspect ratio
-    # -preset medium: Balanced encoding speed
+    # -c:v/-crf or hardware equivalent: see _encoder_args
     # -c:a aac -b:a 128k: Compress audio to 128kbps AAC
     cmd = [
         "ffmpeg",
+        "-loglevel", "error",
+        "-nostats",
         "-i", str(input_path),
         "-vf", f"scale=-2:'min({max_height},ih)'",
-        "-c:v", "libx264",
-        "-crf", str(crf),
-        "-preset", "medium",
+        *_encoder_args(crf),
         "-c:a", "aac",
         "-b:a", "128k",
         "-movflags", "+faststart",  # Enable fast start for web playback
@@ -329,10 +665,12 @@ def compress_video(input_path: str, output_path: str | None = None, crf: int = 2
     print(f"Settings: CRF={crf}, max_height={max_height}px")
 
     try:
+        # With -loglevel error -nostats the captured stderr is tiny on
+        # success instead of megabytes of progress lines
         result = subprocess.run(
             cmd,
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             timeout=300  # 5 minute timeout for compression
         )
 
@@ -357,7 +695,7 @@ def compress_video(input_path: str, output_path: str | None = None, crf: int = 2
             return str(final_output_path)
         else:
             print(f"❌ Compression failed!")
-            print(f"stderr: {result.stderr}")
+            print(f"stderr: {result.stderr.decode(errors='replace')}")
             # Clean up temp file if it exists
             if temp_output_path.exists() and replace_original:
                 temp_output_path.unlink()
@@ -377,6 +715,110 @@ def compress_video(input_path: str, output_path: str | None = None, crf: int = 2
         return None
 
 
+def _kill_and_reap(*procs: subprocess.Popen | None):
+    """Kill and wait() any started children so a failed piped run doesn't
+    leave yt-dlp blocked on a pipe nobody reads, or zombies accumulating
+    in the long-running watcher process."""
+    for proc in procs:
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+    for proc in procs:
+        if proc is not None:
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                pass
+
+
+def download_and_compress_streaming(url: str, output_path: str | Path, crf: int = 28, max_height: int = 720) -> str | None:
+    """
+    Download and compress in one pass: yt-dlp streams the video to stdout
+    and ffmpeg reads it from stdin, so the uncompressed file never touches
+    disk and compression overlaps the download.
+
+    Not every reel can stream this way (fragmented/HLS formats need
+    seekable input), so callers should fall back to the two-step
+    download_video_with_ytdlp + compress_video path on failure.
+
+    Args:
+        url: The Instagram reel URL
+        output_path: Path for the compressed output file
+        crf: Constant Rate Factor (18-28 recommended, higher = smaller file)
+        max_height: Maximum video height in pixels (preserves aspect ratio)
+
+    Returns:
+        Path to the compressed video file, or None if the piped run failed
+    """
+    if not _tool_path("yt-dlp") or not _tool_path("ffmpeg"):
+        return None
+
+    output_path = Path(output_path)
+
+    ytdlp_cmd = [
+        "yt-dlp",
+        "--no-warnings",
+        "-o", "-",
+        "--no-playlist",
+        url
+    ]
+    ffmpeg_cmd = [
+        "ffmpeg",
+        "-loglevel", "error",
+        "-nostats",
+        "-i", "pipe:0",
+        "-vf", f"scale=-2:'min({max_height},ih)'",
+        *_encoder_args(crf),
+        "-c:a", "aac",
+        "-b:a", "128k",
+        "-movflags", "+faststart",
+        "-y",
+        str(output_path)
+    ]
+
+    print(f"\n📹 Downloading + compressing (piped yt-dlp | ffmpeg)...")
+
+    ytdlp = ffmpeg = None
+    try:
+        ytdlp = subprocess.Popen(
+            ytdlp_cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        ffmpeg = subprocess.Popen(
+            ffmpeg_cmd,
+            stdin=ytdlp.stdout,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        # Let ffmpeg hold the only reference to yt-dlp's stdout so a
+        # dying ffmpeg propagates SIGPIPE back to yt-dlp
+        ytdlp.stdout.close()
+
+        ffmpeg.wait(timeout=300)
+        ytdlp.wait(timeout=120)
+
+        if (ytdlp.returncode == 0 and ffmpeg.returncode == 0
+                and output_path.exists() and output_path.stat().st_size > 0):
+            size = output_path.stat().st_size
+            print(f"✅ Streamed download+compress: {output_path}")
+            print(f"   Compressed: {size / 1024 / 1024:.2f} MB")
+            return str(output_path)
+
+        print("⚠️  Piped download failed, falling back to two-step path")
+
+    except subprocess.TimeoutExpired:
+        print("⚠️  Piped download timed out, falling back to two-step path")
+        _kill_and_reap(ytdlp, ffmpeg)
+    except Exception as e:
+        print(f"⚠️  Piped download error ({e}), falling back to two-step path")
+        _kill_and_reap(ytdlp, ffmpeg)
+
+    # Clean up any partial output
+    if output_path.exists():
+        output_path.unlink()
+    return None
+
+
 def generate_markdown(info: dict, parsed_desc: dict, url: str, video_filename: str | None = None) -> str:
     """
     Generate a formatted markdown string from the extracted info.
@@ -390,57 +832,91 @@ def generate_markdown(info: dict, parsed_desc: dict, url: str, video_filename: s
     Returns:
         Formatted markdown string
     """
-    # Build YAML frontmatter
-    frontmatter_lines = [
-        "---",
-        f"source: {url}",
-        f"author: {parsed_desc.get('author', 'N/A')}",
-        f"date: {parsed_desc.get('date', 'N/A')}",
-        f"likes: {parsed_desc.get('likes', 'N/A')}",
-        f"comments: {parsed_desc.get('comments', 'N/A')}",
-        "---",
-        "",
-    ]
+    # Merge once with defaults so every field below is a plain subscript
+    # instead of a per-field .get fallback
+    data = {
+        "author": "N/A",
+        "date": "N/A",
+        "likes": "N/A",
+        "comments": "N/A",
+        "og_image": "N/A",
+    } | info | parsed_desc
 
-    md_lines = frontmatter_lines + [
-        "# Instagram Reel",
-        "",
-        "## Description",
-        "",
-        f"{parsed_desc['description_text']}",
-        "",
-    ]
+    # One pre-formatted chunk per section instead of per-line list appends
+    chunks = [f"""---
+source: {url}
+author: {data['author']}
+date: {data['date']}
+likes: {data['likes']}
+comments: {data['comments']}
+---
+
+# Instagram Reel
+
+## Description
+
+{data['description_text']}
+"""]
 
     # Add video embed if available (Obsidian syntax)
     if video_filename:
-        md_lines.extend([
-            "---",
-            "",
-            "## Video",
-            "",
-            f"![[{video_filename}]]",
-            "",
-        ])
+        chunks.append(f"\n---\n\n## Video\n\n![[{video_filename}]]\n")
 
     # Add thumbnail if available
-    if info.get("og_image") and info["og_image"] != "N/A":
-        md_lines.extend([
-            "---",
-            "",
-            "## Thumbnail",
-            "",
-            f"![Thumbnail]({info['og_image']})",
-            "",
-        ])
+    og_image = data["og_image"]
+    if og_image and og_image != "N/A":
+        chunks.append(
+            f"\n---\n\n## Thumbnail\n\n![Thumbnail]({og_image})\n")
+
+    return "".join(chunks)
+
+
+@lru_cache(maxsize=None)
+def _tool_path(name: str) -> str | None:
+    """shutil.which, memoized - each lookup stats every PATH entry, and
+    the watcher checks for yt-dlp/ffmpeg once per processed URL."""
+    return shutil.which(name)
+
 
-    return "\n".join(md_lines)
+def _fast_move(src: str | Path, dst: str | Path) -> None:
+    """Move a file, preferring the atomic same-filesystem rename.
+
+    os.replace is a single syscall when src and dst share a volume;
+    shutil.move only runs for genuine cross-device moves, where the
+    full copy is unavoidable."""
+    try:
+        os.replace(src, dst)
+    except OSError:
+        shutil.move(src, dst)
+
+
+def _load_metadata_cache(cache_file: Path) -> dict:
+    """Load the extraction cache, returning an empty one on any error."""
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
 
+def _save_metadata_cache(cache_file: Path, cache: dict) -> None:
+    """Persist the extraction cache; failures are non-fatal."""
+    try:
+        with open(cache_file, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"⚠️  Could not write metadata cache: {e}")
+
+
+@lru_cache(maxsize=1024)
 def extract_reel_id(url: str) -> str:
-    """Extract the reel ID from an Instagram URL."""
+    """Extract the reel ID from an Instagram URL.
+
+    Cached: the same URL is normalized here several times per run (queue
+    scan, temp-dir naming, processing, cache keying)."""
     # Remove trailing slash and get last path segment
     url = url.rstrip('/')
-    match = re.search(r'/(?:reel|p)/([\w-]+)', url)
+    match = _REEL_ID_RE.search(url)
     if match:
         return match.group(1)
     # Fallback: use last segment
@@ -453,7 +929,8 @@ def process_instagram_url(
     attachments_dir: str | Path = ".",
     compress: bool = True,
     save_raw_html: bool = False,
-    temp_dir: str | Path | None = None
+    temp_dir: str | Path | None = None,
+    use_cache: bool = True
 ) -> dict:
     """
     Process a single Instagram URL: fetch metadata, download video, create markdown.
@@ -464,8 +941,11 @@ def process_instagram_url(
         attachments_dir: Directory to save the final video file
         compress: Whether to compress the video
         save_raw_html: Whether to save the raw HTML response
-        temp_dir: Directory for temporary files (download/compression). 
+        temp_dir: Directory for temporary files (download/compression).
                   Defaults to current working directory.
+        use_cache: Reuse previously extracted metadata (and the video, if
+                   still on disk) for reels seen before, keyed by reel ID
+                   and by page content hash
 
     Returns:
         Dictionary with paths to created files and extracted info
@@ -480,6 +960,11 @@ def process_instagram_url(
     }
 
     try:
+        if not INSTAGRAM_URL_RE.match(url):
+            result["error"] = f"Not a valid Instagram reel/post URL: {url}"
+            print(f"\n❌ {result['error']}")
+            return result
+
         notes_dir = Path(notes_dir)
         attachments_dir = Path(attachments_dir)
         temp_dir = Path(temp_dir) if temp_dir else Path.cwd()
@@ -491,21 +976,59 @@ def process_instagram_url(
         reel_id = extract_reel_id(url)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-        # Fetch the page
-        response = fetch_instagram_reel(url)
-
-        # Optionally save raw HTML
-        if save_raw_html:
-            # TODO: Change the storing of this raw html file to the temp_dir
-            raw_filename = notes_dir / f"response_{reel_id}_{timestamp}.html"
-            save_response_to_file(response, str(raw_filename))
-
-        # Parse with BeautifulSoup
-        soup = parse_with_beautifulsoup(response.text)
-
-        # Extract info
-        info = extract_basic_info(soup)
-        parsed_desc = parse_description(info.get("description", ""))
+        # Check the metadata cache first - a reel seen before (same ID,
+        # or same page content under a different URL) skips the fetch
+        # and parse entirely
+        cache_file = temp_dir / ".metadata_cache.json"
+        cache = _load_metadata_cache(cache_file) if use_cache else {}
+        cached = None
+        if use_cache and not save_raw_html:
+            cached = cache.get("by_reel", {}).get(reel_id)
+
+        content_hash = None
+        if cached is None:
+            # Fetch the page, stopping at </head> unless the full raw
+            # HTML is being kept
+            response = fetch_instagram_reel(url, head_only=not save_raw_html)
+
+            # Don't bother parsing error pages or the login wall - a
+            # cheap status/substring check beats an lxml parse that can
+            # only yield empty fields
+            if (response.status_code >= 400
+                    or b'"login_required"' in response.content[:4096]):
+                result["error"] = (
+                    f"Fetch blocked (HTTP {response.status_code}"
+                    f"{' / login required' if response.status_code < 400 else ''})")
+                print(f"\n❌ {result['error']}")
+                return result
+
+            # Optionally save raw HTML
+            if save_raw_html:
+                # TODO: Change the storing of this raw html file to the temp_dir
+                raw_filename = notes_dir / \
+                    f"response_{reel_id}_{timestamp}.html"
+                save_response_to_file(response, str(raw_filename))
+
+            # Second cache layer: identical page content served under a
+            # redirected/canonicalized URL shares the parsed result
+            content_hash = hashlib.sha256(response.content).hexdigest()
+            if use_cache:
+                hit_id = cache.get("by_hash", {}).get(content_hash)
+                if hit_id:
+                    cached = cache.get("by_reel", {}).get(hit_id)
+
+        if cached is not None:
+            print(f"♻️  Using cached metadata for: {reel_id}")
+            info = cached["info"]
+            parsed_desc = cached["parsed_desc"]
+        else:
+            # Extract info (head-only streaming parse) straight from the
+            # response bytes - lxml decodes internally, so the document
+            # is never materialised as a Python str. Structured JSON-LD
+            # data beats regexing the meta description when present.
+            info = extract_basic_info(response.content)
+            parsed_desc = (extract_structured_description(response.content)
+                           or parse_description(info.get("description", "")))
         result["info"] = {**info, **parsed_desc}
 
         print("\n" + "=" * 50)
@@ -516,16 +1039,36 @@ def process_instagram_url(
                 "..." if len(str(value)) > 100 else value
             print(f"{key}: {display_value}")
 
-        # Download video to temp directory
-        print("\n" + "=" * 50)
-        print("VIDEO DOWNLOAD:")
-        print("=" * 50)
+        # Reuse the cached video if it is still on disk - skips yt-dlp
+        # and ffmpeg entirely
+        cached_video = cached.get("video_path") if cached else None
+        if cached_video and Path(cached_video).exists():
+            print(f"♻️  Using cached video: {cached_video}")
+            final_video_path = Path(cached_video)
+            temp_video_path = None
+        else:
+            print("\n" + "=" * 50)
+            print("VIDEO DOWNLOAD:")
+            print("=" * 50)
 
-        video_filename = f"{reel_id}_temp"
-        temp_video_path = download_video_with_ytdlp(
-            url, str(temp_dir), video_filename)
+            final_video_path = None
+            temp_video_path = None
 
-        final_video_path = None
+            # Fused path: pipe yt-dlp straight into ffmpeg so the
+            # uncompressed download never hits disk
+            if compress:
+                piped_path = download_and_compress_streaming(
+                    url, temp_dir / f"{reel_id}_compressed.mp4")
+                if piped_path:
+                    final_video_path = attachments_dir / f"{reel_id}.mp4"
+                    _fast_move(piped_path, final_video_path)
+                    print(f"📦 Moved to attachments: {final_video_path}")
+
+            # Two-step fallback: download to temp, compress/move below
+            if final_video_path is None:
+                video_filename = f"{reel_id}_temp"
+                temp_video_path = download_video_with_ytdlp(
+                    url, str(temp_dir), video_filename)
         if temp_video_path:
             if compress:
                 print("\n" + "=" * 50)
@@ -544,13 +1087,13 @@ def process_instagram_url(
 
                     # Move compressed file to final destination
                     final_video_path = attachments_dir / f"{reel_id}.mp4"
-                    shutil.move(compressed_temp_path, final_video_path)
+                    _fast_move(compressed_temp_path, final_video_path)
                     print(f"📦 Moved to attachments: {final_video_path}")
             else:
                 # No compression - move directly to attachments
                 ext = Path(temp_video_path).suffix
                 final_video_path = attachments_dir / f"{reel_id}{ext}"
-                shutil.move(temp_video_path, final_video_path)
+                _fast_move(temp_video_path, final_video_path)
                 print(f"📦 Moved to attachments: {final_video_path}")
 
         result["video_path"] = str(
@@ -580,6 +1123,18 @@ def process_instagram_url(
         print(f"\n✅ Markdown saved to: {md_path}")
         result["markdown_path"] = str(md_path)
 
+        # Record the extraction so a re-queued or re-shared reel is a
+        # cache hit next time
+        if use_cache:
+            cache.setdefault("by_reel", {})[reel_id] = {
+                "info": info,
+                "parsed_desc": parsed_desc,
+                "video_path": result["video_path"],
+            }
+            if content_hash:
+                cache.setdefault("by_hash", {})[content_hash] = reel_id
+            _save_metadata_cache(cache_file, cache)
+
         result["success"] = True
         print(f"\n🎉 Successfully processed: {url}")
 
@@ -626,6 +1181,11 @@ def main():
         default="temp",
         help="Directory for temporary files during download/compression (default: temp)"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached metadata and re-fetch/re-parse the reel"
+    )
 
     args = parser.parse_args()
 
@@ -635,7 +1195,8 @@ def main():
         attachments_dir=args.attachments_dir,
         compress=not args.no_compress,
         save_raw_html=args.save_html,
-        temp_dir=args.temp_dir
+        temp_dir=args.temp_dir,
+        use_cache=not args.no_cache
     )
 
     if not result["success"]:
@@ -7,13 +7,17 @@ Optionally enhances notes with AI to generate better titles, tags, and summaries
 All paths are configurable via .env file. See config.py for details.
 """
 
+import hashlib
+import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import PatternMatchingEventHandler
 
-from fetch_instagram import process_instagram_url
+from fetch_instagram import extract_reel_id, process_instagram_url
 from config import (
     AUTO_ENHANCE,
     NOTES_DIR,
@@ -24,17 +28,50 @@ from config import (
     validate_config as validate_ai_config,
 )
 
-# Regex pattern to match Instagram URLs
+# Regex pattern to match Instagram URLs, compiled once since the queue
+# scan runs on every file-modified event
 INSTAGRAM_URL_PATTERN = r'https?://(?:www\.)?instagram\.com/(?:reel|p)/[\w-]+'
+_INSTAGRAM_URL_RE = re.compile(INSTAGRAM_URL_PATTERN)
 
+# Number of URLs processed in parallel - each one spends most of its
+# time waiting on the page fetch, yt-dlp, and ffmpeg
+MAX_WORKERS = int(os.getenv("WATCHER_MAX_WORKERS", "4"))
 
-class InstagramQueueHandler(FileSystemEventHandler):
-    """Handles file system events for the Instagram queue file."""
+
+class InstagramQueueHandler(PatternMatchingEventHandler):
+    """Handles file system events for the Instagram queue file.
+
+    Events are pattern-filtered to the queue file before dispatch, so
+    modifications to other files in the watched directory (e.g. the rest
+    of an Obsidian vault folder) never reach our handler code."""
 
     def __init__(self):
+        super().__init__(patterns=[str(QUEUE_FILE), f"*/{QUEUE_FILE.name}"],
+                         ignore_directories=True)
         self.processed_urls = set()
         self.tracking_file = TEMP_DIR / ".processed_urls"
+        # Guards processed_urls, the tracking file, and queue-file
+        # rewrites now that URLs are processed on multiple threads
+        self._lock = threading.Lock()
+        self._in_flight = set()
+        # Editors flush several modify events per save; collapse each
+        # burst into one queue scan
+        self._last_mtime = 0.0
+        self._debounce_timer: threading.Timer | None = None
+        # Byte offset of the last scanned queue content plus a hash of
+        # everything before it: each scan only regex-searches what was
+        # appended since the previous one, but any change to the
+        # already-scanned prefix (users may paste URLs anywhere, and
+        # editors like Obsidian rewrite the whole file on save) forces a
+        # full rescan
+        self._queue_offset = 0
+        self._scanned_hash = b""
+        self._pool = ThreadPoolExecutor(max_workers=MAX_WORKERS)
         self._load_processed()
+        # Kept open in append mode: each processed URL costs one short
+        # write instead of rewriting the whole file every time
+        self.tracking_file.parent.mkdir(parents=True, exist_ok=True)
+        self._track_fp = self.tracking_file.open("a", encoding="utf-8")
 
     def _load_processed(self):
         """Load already processed URLs from the tracking file."""
@@ -46,18 +83,58 @@ class InstagramQueueHandler(FileSystemEventHandler):
                 f"📋 Loaded {len(self.processed_urls)} previously processed URLs")
 
     def _save_processed(self, url: str):
-        """Save a processed URL to the tracking file."""
-        self.processed_urls.add(url)
-        self.tracking_file.parent.mkdir(parents=True, exist_ok=True)
-        self.tracking_file.write_text(
-            "\n".join(sorted(self.processed_urls)), encoding="utf-8")
+        """Append a processed URL to the tracking file."""
+        with self._lock:
+            self.processed_urls.add(url)
+            self._track_fp.write(url + "\n")
+            self._track_fp.flush()
+
+    def close(self):
+        """Flush state on shutdown: wait for in-flight workers, then
+        rewrite the tracking file sorted and deduplicated (appends may
+        contain repeats across restarts)."""
+        with self._lock:
+            if self._debounce_timer is not None:
+                self._debounce_timer.cancel()
+        # Workers still running would otherwise append to a closed
+        # handle and have their URLs miss the final rewrite; wait for
+        # them outside the lock, which _save_processed needs
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            self._track_fp.close()
+            self.tracking_file.write_text(
+                "\n".join(sorted(self.processed_urls)) + "\n",
+                encoding="utf-8")
 
     def on_modified(self, event):
-        """Called when a file in the watched directory is modified."""
-        # Only process if it's our queue file
-        if Path(event.src_path).resolve() != QUEUE_FILE.resolve():
+        """Called when the queue file is modified (pattern-filtered).
+
+        The patterns plus the non-recursive watch of the queue file's
+        own directory make a name check sufficient here - no resolve()
+        syscalls per event."""
+        if Path(event.src_path).name != QUEUE_FILE.name:
             return
 
+        # Skip events that didn't actually change the file
+        try:
+            mtime = QUEUE_FILE.stat().st_mtime
+        except OSError:
+            return
+        if mtime == self._last_mtime:
+            return
+        self._last_mtime = mtime
+
+        # Restart the debounce window so a burst of events from one save
+        # triggers a single scan
+        with self._lock:
+            if self._debounce_timer is not None:
+                self._debounce_timer.cancel()
+            self._debounce_timer = threading.Timer(0.5, self._scan_queue)
+            self._debounce_timer.daemon = True
+            self._debounce_timer.start()
+
+    def _scan_queue(self):
+        """Debounced queue scan, run off a timer thread."""
         print(f"\n📝 Queue file modified, checking for new URLs...")
         self.process_queue()
 
@@ -67,11 +144,33 @@ class InstagramQueueHandler(FileSystemEventHandler):
             print(f"⚠️  Queue file not found: {QUEUE_FILE}")
             return
 
-        content = QUEUE_FILE.read_text(encoding="utf-8")
-        urls = re.findall(INSTAGRAM_URL_PATTERN, content)
-
-        # Filter out already processed URLs
-        new_urls = [url for url in urls if url not in self.processed_urls]
+        # Read, scan, and update the offset under the lock so a scan
+        # can't race _update_queue_statuses' rewrite of the same file
+        # (write_text is not atomic - reading mid-rewrite would record a
+        # bogus offset against truncated content)
+        with self._lock:
+            # Scan only the tail added since the last scan, after
+            # verifying the already-scanned prefix is byte-identical - a
+            # file length that grew does not mean the old content is
+            # untouched, so any prefix change (mid-file paste,
+            # whole-file editor rewrite) triggers a full rescan
+            content = QUEUE_FILE.read_bytes()
+            offset = self._queue_offset
+            if offset > len(content) or (
+                    offset and self._scanned_hash != hashlib.blake2b(
+                        content[:offset], digest_size=16).digest()):
+                offset = 0
+            urls = _INSTAGRAM_URL_RE.findall(content[offset:].decode("utf-8"))
+            self._queue_offset = len(content)
+            self._scanned_hash = hashlib.blake2b(
+                content, digest_size=16).digest()
+
+            # Filter out already processed URLs and ones another thread
+            # is still working on (queue rewrites re-trigger this scan)
+            new_urls = [url for url in urls
+                        if url not in self.processed_urls
+                        and url not in self._in_flight]
+            self._in_flight.update(new_urls)
 
         if not new_urls:
             print("✅ No new URLs to process")
@@ -79,11 +178,23 @@ class InstagramQueueHandler(FileSystemEventHandler):
 
         print(f"\n🆕 Found {len(new_urls)} new URL(s) to process")
 
-        for url in new_urls:
-            self._process_url(url)
-
-    def _process_url(self, url: str):
-        """Process a single Instagram URL."""
+        futures = {self._pool.submit(self._process_url, url): url
+                   for url in new_urls}
+        try:
+            statuses = {}
+            for future in as_completed(futures):
+                statuses[futures[future]] = future.result()
+            self._update_queue_statuses(statuses)
+        finally:
+            with self._lock:
+                self._in_flight.difference_update(futures.values())
+
+    def _process_url(self, url: str) -> tuple:
+        """Process a single Instagram URL.
+
+        Returns:
+            (success, error) for the batch queue-status update
+        """
         print(f"\n{'=' * 60}")
         print(f"🔄 Processing: {url}")
         print('=' * 60)
@@ -95,25 +206,26 @@ class InstagramQueueHandler(FileSystemEventHandler):
                 attachments_dir=ATTACHMENTS_DIR,
                 compress=True,
                 save_raw_html=False,
-                temp_dir=TEMP_DIR
+                # Per-reel temp subdirectory so concurrent yt-dlp/ffmpeg
+                # runs never collide on intermediate filenames
+                temp_dir=TEMP_DIR / extract_reel_id(url)
             )
 
             if result["success"]:
                 self._save_processed(url)
-                self._update_queue_status(url, success=True)
                 print(f"\n✅ Successfully processed: {url}")
 
                 # AI Enhancement (if enabled)
                 if AUTO_ENHANCE and validate_ai_config():
                     self._enhance_with_ai(result)
-            else:
-                self._update_queue_status(
-                    url, success=False, error=result.get("error"))
-                print(f"\n❌ Failed to process: {url}")
+                return True, None
+
+            print(f"\n❌ Failed to process: {url}")
+            return False, result.get("error")
 
         except Exception as e:
-            self._update_queue_status(url, success=False, error=str(e))
             print(f"\n❌ Error processing {url}: {e}")
+            return False, str(e)
 
     def _enhance_with_ai(self, result: dict):
         """Enhance the downloaded reel with AI."""
@@ -137,24 +249,52 @@ class InstagramQueueHandler(FileSystemEventHandler):
         except Exception as e:
             print(f"⚠️  AI enhancement error: {e}")
 
-    def _update_queue_status(self, url: str, success: bool, error: str | None = None):
-        """Update the queue file to mark URL as processed or failed."""
-        if not QUEUE_FILE.exists():
-            return
+    def _update_queue_statuses(self, statuses: dict):
+        """Mark a batch of URLs as processed or failed in the queue file.
 
-        content = QUEUE_FILE.read_text(encoding="utf-8")
+        One regex pass over the content replaces every URL in the batch
+        with its status marker, then a single write, instead of a full
+        read-replace-write cycle per URL.
 
-        # Find the URL and add a status marker
-        if success:
-            # Mark as done with checkmark
-            new_content = content.replace(url, f"✅ {url}")
-        else:
-            # Mark as failed
-            error_msg = f" (Error: {error})" if error else ""
-            new_content = content.replace(url, f"❌ {url}{error_msg}")
+        Args:
+            statuses: Mapping of url -> (success, error)
+        """
+        if not statuses or not QUEUE_FILE.exists():
+            return
 
-        if new_content != content:
-            QUEUE_FILE.write_text(new_content, encoding="utf-8")
+        status_map = {}
+        for url, (success, error) in statuses.items():
+            if success:
+                # Mark as done with checkmark
+                status_map[url] = f"✅ {url}"
+            else:
+                # Mark as failed
+                error_msg = f" (Error: {error})" if error else ""
+                status_map[url] = f"❌ {url}{error_msg}"
+
+        # Read-modify-write under the lock so concurrent batches don't
+        # clobber each other's status markers
+        with self._lock:
+            content = QUEUE_FILE.read_text(encoding="utf-8")
+
+            def _mark(match):
+                url = match.group(0)
+                replacement = status_map.get(url)
+                if replacement is None:
+                    return url
+                # Leave already-marked occurrences alone
+                prefix = content[max(0, match.start() - 2):match.start()]
+                if "✅" in prefix or "❌" in prefix:
+                    return url
+                return replacement
+
+            new_content = _INSTAGRAM_URL_RE.sub(_mark, content)
+
+            if new_content != content:
+                QUEUE_FILE.write_text(new_content, encoding="utf-8")
+                # The rewrite shifts byte positions; force the next scan
+                # to cover the whole file again
+                self._queue_offset = 0
 
 
 def create_queue_file_if_missing():
@@ -236,6 +376,7 @@ def main():
         observer.stop()
 
     observer.join()
+    event_handler.close()
     print("✅ Watcher stopped")
 
 